@@ -49,9 +49,13 @@ class AbsASRModel(AbsModel):
                     f"fall back to non-batch implementation."
                 )
 
-    def _build_model(self, providers, use_quantized):
-        self.encoder = get_encoder(self.config.encoder, providers, use_quantized)
-        decoder = get_decoder(self.config.decoder, providers, use_quantized)
+    def _build_model(self, providers, use_quantized, intra_op_num_threads=0):
+        self.encoder = get_encoder(
+            self.config.encoder, providers, use_quantized, intra_op_num_threads
+        )
+        decoder = get_decoder(
+            self.config.decoder, providers, use_quantized, intra_op_num_threads
+        )
         scorers = {"decoder": decoder}
         weights = {}
         if not self.config.transducer.use_transducer_decoder:
@@ -72,7 +76,7 @@ class AbsASRModel(AbsModel):
             )
             scorers.update(joint_network=joint_network)
 
-        lm = get_lm(self.config, providers, use_quantized)
+        lm = get_lm(self.config, providers, use_quantized, intra_op_num_threads)
         if lm is not None:
             scorers.update(lm=lm)
             weights.update(lm=self.config.weights.lm)
@@ -18,6 +18,7 @@ class Speech2Text(AbsASRModel):
         providers: List[str] = ["CPUExecutionProvider"],
         use_quantized: bool = False,
         cache_dir: Optional[Union[Path, str]] = None,
+        intra_op_num_threads: int = 0,
     ):
         assert check_argument_types()
         self._check_argument(tag_name, model_dir, cache_dir)
@@ -34,7 +35,7 @@ class Speech2Text(AbsASRModel):
 
         # check quantize and optimize model
         self._check_flags(use_quantized)
-        self._build_model(providers, use_quantized)
+        self._build_model(providers, use_quantized, intra_op_num_threads)
 
         if self.config.transducer.use_transducer_decoder:
             self.start_idx = 1
@@ -26,6 +26,7 @@ class StreamingSpeech2Text(AbsASRModel):
         disable_repetition_detection=False,
         encoded_feat_length_limit=0,
         decoder_text_length_limit=0,
+        intra_op_num_threads: int = 0,
     ):
         assert check_argument_types()
         self._check_argument(tag_name, model_dir, cache_dir)
@@ -49,7 +50,7 @@ class StreamingSpeech2Text(AbsASRModel):
         self.config.encoder.hop_size = hop_size
         self.config.encoder.look_ahead = look_ahead
 
-        self._build_model(providers, use_quantized)
+        self._build_model(providers, use_quantized, intra_op_num_threads)
 
         # Fix beam_search components
         self.beam_search = BatchBeamSearchOnline(
@@ -168,6 +168,22 @@ class BatchBeamSearch(BeamSearch):
             new_states[k] = v
         return new_states
 
+    def expand_x(self, x: np.ndarray, n_batch: int) -> np.ndarray:
+        """Repeat the encoded feature for all running hypotheses.
+        All hypotheses are scored with a single batch_score call per step,
+        and x does not change during the search. So the repeated feature is
+        cached and only rebuilt when x changes or the beam grows.
+        Args:
+            x (np.ndarray): Encoded speech feature (T, D)
+            n_batch (int): The number of running hypotheses
+        Returns:
+            np.ndarray: The repeated feature (n_batch, T, D)
+        """
+        cache = getattr(self, "_expanded_x", None)
+        if cache is None or cache[0] is not x or len(cache[1]) < n_batch:
+            self._expanded_x = (x, np.repeat(x[None], n_batch, axis=0))
+        return self._expanded_x[1][:n_batch]
+
     def search(self, running_hyps: BatchHypothesis, x: np.ndarray) -> BatchHypothesis:
         """Search new tokens for running hypotheses and encoded speech x.
         Args:
@@ -180,10 +196,7 @@ class BatchBeamSearch(BeamSearch):
         part_ids = None  # no pre-beam
         # batch scoring
         weighted_scores = np.zeros((n_batch, self.n_vocab), dtype=x.dtype)
-        scores, states = self.score_full(
-            running_hyps,
-            np.vstack([x for _ in range(n_batch)]).reshape(n_batch, *x.shape),
-        )
+        scores, states = self.score_full(running_hyps, self.expand_x(x, n_batch))
         for k in self.full_scorers:
             weighted_scores += self.weights[k] * scores[k]
         # partial scoring
@@ -6,10 +6,15 @@ from espnet_onnx.asr.model.decoders.xformer import XformerDecoder
 from espnet_onnx.utils.config import Config
 
 
-def get_decoder(config: Config, providers: List[str], use_quantized: bool = False):
+def get_decoder(
+    config: Config,
+    providers: List[str],
+    use_quantized: bool = False,
+    intra_op_num_threads: int = 0,
+):
     if config.dec_type == "RNNDecoder":
         return RNNDecoder(config, providers, use_quantized)
     elif config.dec_type == "TransducerDecoder":
         return TransducerDecoder(config, providers, use_quantized)
     else:
-        return XformerDecoder(config, providers, use_quantized)
+        return XformerDecoder(config, providers, use_quantized, intra_op_num_threads)
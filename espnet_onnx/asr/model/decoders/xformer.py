@@ -5,6 +5,7 @@ import onnxruntime
 
 from espnet_onnx.asr.scorer.interface import BatchScorerInterface
 from espnet_onnx.utils.config import Config
+from espnet_onnx.utils.session import get_session_options
 
 
 class XformerDecoder(BatchScorerInterface):
@@ -13,21 +14,26 @@ class XformerDecoder(BatchScorerInterface):
         config: Config,
         providers: List[str],
         use_quantized: bool = False,
+        intra_op_num_threads: int = 0,
     ):
         """Onnx support for espnet2.asr.decoder.transformer_decoder
 
         Args:
             config (Config):
             use_quantized (bool): Flag to use quantized model
+            intra_op_num_threads (int): Number of intra-op threads.
+                0 uses the default of onnxruntime.
         """
         if use_quantized:
             self.decoder = onnxruntime.InferenceSession(
                 config.quantized_model_path,
+                sess_options=get_session_options(intra_op_num_threads),
                 providers=providers,
             )
         else:
             self.decoder = onnxruntime.InferenceSession(
                 config.model_path,
+                sess_options=get_session_options(intra_op_num_threads),
                 providers=providers,
             )
         self.config = config
@@ -39,20 +45,41 @@ class XformerDecoder(BatchScorerInterface):
         self.out_caches = [
             d.name for d in self.decoder.get_outputs() if "cache" in d.name
         ]
+        # input names are fixed for the session, so resolve them once
+        # instead of querying onnxruntime on every decoding step.
+        self._non_cache_in_names = frozenset(
+            d.name for d in self.decoder.get_inputs() if "cache" not in d.name
+        )
+        self._has_tgt = "tgt" in self._non_cache_in_names
+        self._has_memory = "memory" in self._non_cache_in_names
+        # match the token dtype of the exported model, e.g. "tensor(int64)".
+        self._tgt_dtype = np.dtype(np.int64)
+        for d in self.decoder.get_inputs():
+            if d.name == "tgt":
+                self._tgt_dtype = np.dtype(d.type[len("tensor(") : -1])
+        self.binding = self.decoder.io_binding()
+        # Flat buffer for the merged input caches, reused across steps.
+        self.cache_buffer = np.empty(0, dtype=np.float32)
+        # OrtValue of the last memory input and the array it was created from.
+        self.memory_cache = None
 
     def batch_score(
         self, ys: np.ndarray, states: List[Any], xs: np.ndarray
-    ) -> Tuple[np.ndarray, List[Any]]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """Score new token batch.
         Args:
             ys (np.ndarray): np.int64 prefix tokens (n_batch, ylen).
             states (List[Any]): Scorer states for prefix tokens.
+                Each state is None or an array of caches with shape
+                `(n_layers, cache_length, odim)`.
             xs (np.ndarray):
                 The encoder feature that generates ys (n_batch, xlen, n_feat).
         Returns:
-            tuple[np.ndarray, List[Any]]: Tuple of
+            tuple[np.ndarray, np.ndarray]: Tuple of
                 batchfied scores for next token with shape of `(n_batch, n_vocab)`
-                and next state list for ys.
+                and next states for ys. The states are a view with shape of
+                `(n_batch, n_layers, cache_length + 1, odim)`, and are not
+                split per hypothesis. Select a state with `states[b]`.
         """
         # merge states
         if len(ys.shape) == 1:
@@ -60,38 +87,82 @@ class XformerDecoder(BatchScorerInterface):
 
         n_batch = len(ys)
         if states[0] is None:
-            batch_state = [
-                np.zeros((1, 1, self.odim), dtype=np.float32)
-                for _ in range(self.n_layers)
-            ]
+            batch_state = np.zeros(
+                (self.n_layers, n_batch, 1, self.odim), dtype=np.float32
+            )
         else:
-            # transpose state of [batch, layer] into [layer, batch]
-            batch_state = [
-                np.concatenate([states[b][i][None, :] for b in range(n_batch)])
-                for i in range(self.n_layers)
-            ]
+            # merge states of [batch](layer, ...) into (layer, batch, ...)
+            batch_state = self.get_cache_buffer(
+                (self.n_layers, n_batch, *states[0].shape[1:])
+            )
+            np.concatenate([s[:, None] for s in states], axis=1, out=batch_state)
 
         # batch decoding
-        input_dict = self.get_input_dict(ys, xs, batch_state)
+        # Each layer appends one frame to its cache, and onnxruntime writes
+        # the output caches of all layers into a single array.
+        out_caches = np.empty(
+            (self.n_layers, n_batch, batch_state.shape[2] + 1, self.odim),
+            dtype=np.float32,
+        )
+        ort_inputs = self.get_input_dict(ys, batch_state)
+        logp = self.run_with_binding(ort_inputs, xs, out_caches)
 
-        logp, *states = self.decoder.run(["y"] + self.out_caches, input_dict)
-
-        if type(self.n_layers) == 1:
-            states = [states]
-
-        # transpose state of [layer, batch] into [batch, layer]
-        state_list = [
-            [states[i][b] for i in range(self.n_layers)] for b in range(n_batch)
-        ]
+        # Return the caches as (batch, layer, ...) without splitting them.
+        # The beam search selects states with `state_list[b]`, which returns
+        # the (layer, ...) view of a hypothesis only when it is needed.
+        state_list = out_caches.swapaxes(0, 1)
 
         return logp, state_list
 
-    def get_input_dict(self, ys, xs, state):
-        in_names = [d.name for d in self.decoder.get_inputs() if "cache" not in d.name]
-        ret = {}
-        if "tgt" in in_names:
-            ret.update(tgt=ys.astype(np.int64))
-        if "memory" in in_names:
-            ret.update(memory=xs)
-        ret.update({k: v for (k, v) in zip(self.in_caches, state)})
+    def get_cache_buffer(self, shape):
+        """Return a view of the cache buffer with the given shape.
+        The input caches are only read during the run, so the buffer can be
+        overwritten in the next step. It grows geometrically with ylen.
+        Output caches are kept by the hypotheses and are not reused.
+        """
+        size = int(np.prod(shape))
+        if self.cache_buffer.size < size:
+            self.cache_buffer = np.empty(
+                max(size, 2 * self.cache_buffer.size), dtype=np.float32
+            )
+        return self.cache_buffer[:size].reshape(shape)
+
+    def get_input_dict(self, ys, state):
+        """Create the inputs that change every step.
+        Caches and tokens are bound from the numpy arrays without copy.
+        """
+        ret = {k: np.ascontiguousarray(v) for k, v in zip(self.in_caches, state)}
+        if self._has_tgt:
+            ret["tgt"] = np.ascontiguousarray(ys.astype(self._tgt_dtype, copy=False))
         return ret
+
+    def get_memory_ortvalue(self, xs):
+        # Beam search passes a new view of the same array on each step,
+        # so compare the buffer instead of the object. The cache keeps xs
+        # alive, so another array cannot reuse its address.
+        key = (xs.ctypes.data, xs.shape, xs.strides, xs.dtype)
+        if self.memory_cache is None or self.memory_cache[0] != key:
+            self.memory_cache = (key, xs, self.to_ortvalue(xs))
+        return self.memory_cache[2]
+
+    @staticmethod
+    def to_ortvalue(arr):
+        return onnxruntime.OrtValue.ortvalue_from_numpy(np.ascontiguousarray(arr))
+
+    def run_with_binding(self, ort_inputs, xs, out_caches):
+        # bind_cpu_input uses the numpy buffers of ort_inputs directly, so keep
+        # them alive until the run finishes. The memory is the same array for
+        # all steps of a beam search, so its OrtValue is created only once.
+        self.binding.clear_binding_inputs()
+        self.binding.clear_binding_outputs()
+        for k, v in ort_inputs.items():
+            self.binding.bind_cpu_input(k, v)
+        if self._has_memory:
+            self.binding.bind_ortvalue_input("memory", self.get_memory_ortvalue(xs))
+        self.binding.bind_output("y")
+        for name, c in zip(self.out_caches, out_caches):
+            self.binding.bind_output(
+                name, "cpu", 0, np.float32, c.shape, c.ctypes.data
+            )
+        self.decoder.run_with_iobinding(self.binding)
+        return self.binding.get_outputs()[0].numpy()
@@ -5,8 +5,13 @@ from espnet_onnx.asr.model.encoders.streaming import StreamingEncoder
 from espnet_onnx.utils.config import Config
 
 
-def get_encoder(config: Config, providers: List[str], use_quantized: bool = False):
+def get_encoder(
+    config: Config,
+    providers: List[str],
+    use_quantized: bool = False,
+    intra_op_num_threads: int = 0,
+):
     if config.enc_type == "ContextualXformerEncoder":
-        return StreamingEncoder(config, providers, use_quantized)
+        return StreamingEncoder(config, providers, use_quantized, intra_op_num_threads)
     else:
-        return Encoder(config, providers, use_quantized)
+        return Encoder(config, providers, use_quantized, intra_op_num_threads)
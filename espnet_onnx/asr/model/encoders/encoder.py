@@ -8,6 +8,7 @@ from espnet_onnx.asr.frontend.normalize.global_mvn import GlobalMVN
 from espnet_onnx.asr.frontend.normalize.utterance_mvn import UtteranceMVN
 from espnet_onnx.utils.config import Config
 from espnet_onnx.utils.function import make_pad_mask, mask_fill
+from espnet_onnx.utils.session import get_session_options
 
 
 class Encoder:
@@ -16,17 +17,22 @@ class Encoder:
         encoder_config: Config,
         providers: List[str],
         use_quantized: bool = False,
+        intra_op_num_threads: int = 0,
     ):
         self.config = encoder_config
         # Note that id model was optimized and quantized,
         # then the quantized model should be optimized.
         if use_quantized:
             self.encoder = onnxruntime.InferenceSession(
-                self.config.quantized_model_path, providers=providers
+                self.config.quantized_model_path,
+                sess_options=get_session_options(intra_op_num_threads),
+                providers=providers,
             )
         else:
             self.encoder = onnxruntime.InferenceSession(
-                self.config.model_path, providers=providers
+                self.config.model_path,
+                sess_options=get_session_options(intra_op_num_threads),
+                providers=providers,
             )
 
         if self.config.frontend.frontend_type is None:
@@ -7,6 +7,7 @@ from espnet_onnx.asr.frontend.frontend import Frontend
 from espnet_onnx.asr.frontend.normalize.global_mvn import GlobalMVN
 from espnet_onnx.asr.frontend.normalize.utterance_mvn import UtteranceMVN
 from espnet_onnx.utils.config import Config
+from espnet_onnx.utils.session import get_session_options
 
 
 class StreamingEncoder:
@@ -15,15 +16,20 @@ class StreamingEncoder:
         encoder_config: Config,
         providers: List[str],
         use_quantized: bool = False,
+        intra_op_num_threads: int = 0,
     ):
         self.config = encoder_config
         if use_quantized:
             self.encoder = onnxruntime.InferenceSession(
-                self.config.quantized_model_path, providers=providers
+                self.config.quantized_model_path,
+                sess_options=get_session_options(intra_op_num_threads),
+                providers=providers,
             )
         else:
             self.encoder = onnxruntime.InferenceSession(
-                self.config.model_path, providers=providers
+                self.config.model_path,
+                sess_options=get_session_options(intra_op_num_threads),
+                providers=providers,
             )
 
         self.frontend = Frontend(self.config.frontend, providers, use_quantized)
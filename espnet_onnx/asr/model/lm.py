@@ -5,10 +5,17 @@ from espnet_onnx.asr.model.lms.transformer_lm import TransformerLM
 from espnet_onnx.utils.config import Config
 
 
-def get_lm(config: Config, providers: List[str], use_quantized: bool = False):
+def get_lm(
+    config: Config,
+    providers: List[str],
+    use_quantized: bool = False,
+    intra_op_num_threads: int = 0,
+):
     if config.lm.use_lm:
         if config.lm.lm_type == "SequentialRNNLM":
             return SequentialRNNLM(config.lm, providers, use_quantized)
         elif config.lm.lm_type == "TransformerLM":
-            return TransformerLM(config.lm, providers, use_quantized)
+            return TransformerLM(
+                config.lm, providers, use_quantized, intra_op_num_threads
+            )
     return None
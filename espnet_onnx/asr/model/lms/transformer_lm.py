@@ -5,6 +5,7 @@ import onnxruntime
 from scipy.special import log_softmax
 
 from espnet_onnx.asr.scorer.interface import BatchScorerInterface
+from espnet_onnx.utils.session import get_session_options
 
 
 class TransformerLM(BatchScorerInterface):
@@ -13,14 +14,19 @@ class TransformerLM(BatchScorerInterface):
         config,
         providers: List[str],
         use_quantized: bool = False,
+        intra_op_num_threads: int = 0,
     ):
         if use_quantized:
             self.lm_session = onnxruntime.InferenceSession(
-                config.quantized_model_path, providers=providers
+                config.quantized_model_path,
+                sess_options=get_session_options(intra_op_num_threads),
+                providers=providers,
             )
         else:
             self.lm_session = onnxruntime.InferenceSession(
-                config.model_path, providers=providers
+                config.model_path,
+                sess_options=get_session_options(intra_op_num_threads),
+                providers=providers,
             )
 
         self.enc_output_names = ["y"] + [
@@ -83,7 +89,7 @@ class TransformerLM(BatchScorerInterface):
 
         """
         # merge states
-        ys = ys.astype(np.int64)
+        ys = ys.astype(np.int64, copy=False)
         n_batch = len(ys)
         is_first_iteration = False
         if states[0] is None:
@@ -95,8 +101,7 @@ class TransformerLM(BatchScorerInterface):
         else:
             # transpose state of [batch, layer] into [layer, batch]
             batch_state = [
-                np.concatenate([states[b][i][None, :] for b in range(n_batch)])
-                for i in range(self.nlayers)
+                np.stack([s[i] for s in states]) for i in range(self.nlayers)
             ]
 
         input_dic = {"tgt": ys}
@@ -109,7 +114,5 @@ class TransformerLM(BatchScorerInterface):
             new_state = [new_state[i][:, -1:] for i in range(len(new_state))]
 
         # transpose state of [layer, batch] into [batch, layer]
-        state_list = [
-            [new_state[i][b] for i in range(self.nlayers)] for b in range(n_batch)
-        ]
+        state_list = [[s[b] for s in new_state] for b in range(n_batch)]
         return logp, state_list
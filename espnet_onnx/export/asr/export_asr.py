@@ -12,7 +12,8 @@ import torch
 from espnet2.bin.asr_inference import Speech2Text
 from espnet2.text.sentencepiece_tokenizer import SentencepiecesTokenizer
 from espnet_model_zoo.downloader import ModelDownloader
-from onnxruntime.quantization import quantize_dynamic
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from packaging.version import parse as V
 from typeguard import check_argument_types
 
 from espnet_onnx.export.asr.get_config import (
@@ -48,16 +49,13 @@ class ASRModelExport:
         self.cache_dir = Path(cache_dir)
         self.convert_map = convert_map
 
-        # Use opset_version=12 to avoid optimization error.
-        # When using the original onnxruntime, 'axes' is moved to input from opset_version=13
-        # so optimized model will be invalid for onnxruntime<=1.14.1 (latest in 2023/05)
-        # onnxruntime-1.14.1.espnet is fixed, so developers can use opset_version>12 with 1.14.1.espnet
+        # opset_version=None selects the version in `_get_opset_version`.
         self.export_config = dict(
             use_gpu=False,
             only_onnxruntime=False,
             float16=False,
             use_ort_for_espnet=False,
-            opset_version=12,
+            opset_version=None,
         )
 
     def export(
@@ -74,6 +72,14 @@ class ASRModelExport:
 
         self.export_config["optimize"] = optimize
 
+        # The float16 model is optimized for GPU. Most of the fused nodes do not
+        # have float16 kernels on CPU, and quantization expects a float32 graph.
+        if optimize and self.export_config["float16"]:
+            if not self.export_config["use_gpu"]:
+                raise ValueError("float16=True is only supported with use_gpu=True.")
+            if quantize:
+                raise ValueError("float16=True cannot be used with quantize=True.")
+
         base_dir = self.cache_dir / tag_name.replace(" ", "-")
         export_dir = base_dir / "full"
         export_dir.mkdir(parents=True, exist_ok=True)
@@ -92,14 +98,14 @@ class ASRModelExport:
             self.convert_map,
         )
         enc_out_size = enc_model.get_output_size()
-        self._export_encoder(enc_model, export_dir, verbose)
+        self._export_encoder(enc_model, export_dir, verbose, optimize)
         model_config.update(
             encoder=enc_model.get_model_config(model.asr_model, export_dir)
         )
 
         # export decoder
         dec_model = get_decoder(model.asr_model.decoder, self.export_config)
-        self._export_decoder(dec_model, enc_out_size, export_dir, verbose)
+        self._export_decoder(dec_model, enc_out_size, export_dir, verbose, optimize)
         model_config.update(decoder=dec_model.get_model_config(export_dir))
 
         # export joint_network if transducer decoder is used.
@@ -108,7 +114,7 @@ class ASRModelExport:
                 model.asr_model.joint_network,
                 model_config["beam_search"]["search_type"],
             )
-            self._export_joint_network(joint_network, export_dir, verbose)
+            self._export_joint_network(joint_network, export_dir, verbose, optimize)
             model_config.update(
                 joint_network=joint_network.get_model_config(export_dir)
             )
@@ -116,7 +122,7 @@ class ASRModelExport:
         # export ctc
         if model.asr_model.ctc is not None:
             ctc_model = CTC(model.asr_model.ctc.ctc_lo)
-            self._export_ctc(ctc_model, enc_out_size, export_dir, verbose)
+            self._export_ctc(ctc_model, enc_out_size, export_dir, verbose, optimize)
             model_config.update(ctc=ctc_model.get_model_config(export_dir))
 
         # export lm
@@ -129,7 +135,7 @@ class ASRModelExport:
                 lm_model = get_lm(model.beam_search_transducer.lm, self.export_config)
 
         if lm_model is not None:
-            self._export_lm(lm_model, export_dir, verbose)
+            self._export_lm(lm_model, export_dir, verbose, optimize)
             model_config.update(lm=lm_model.get_model_config(export_dir))
         else:
             model_config.update(lm=dict(use_lm=False))
@@ -237,7 +243,7 @@ class ASRModelExport:
         ret.update(tokenizer=get_tokenizer_config(model.tokenizer, path))
         return ret
 
-    def _export_model(self, model, verbose, path, enc_size=None):
+    def _export_model(self, model, verbose, path, enc_size=None, optimize=False):
         if enc_size:
             dummy_input = model.get_dummy_inputs(enc_size)
         else:
@@ -248,7 +254,7 @@ class ASRModelExport:
             dummy_input,
             os.path.join(path, f"{model.model_name}.onnx"),
             verbose=verbose,
-            opset_version=self.export_config["opset_version"],
+            opset_version=self._get_opset_version(optimize),
             input_names=model.get_input_names(),
             output_names=model.get_output_names(),
             dynamic_axes=model.get_dynamic_axes(),
@@ -258,37 +264,54 @@ class ASRModelExport:
         if hasattr(model, "submodel"):
             for i, sm in enumerate(model.submodel):
                 if sm.require_onnx():
-                    self._export_model(sm, verbose, path, enc_size)
+                    self._export_model(sm, verbose, path, enc_size, optimize)
+
+    def _get_opset_version(self, optimize):
+        if self.export_config["opset_version"] is not None:
+            return self.export_config["opset_version"]
+
+        # Use opset_version=12 to avoid optimization error.
+        # When using the original onnxruntime, 'axes' is moved to input from opset_version=13
+        # so optimized model will be invalid for onnxruntime<=1.14.1 (latest in 2023/05)
+        # onnxruntime-1.14.1.espnet is fixed, so developers can use opset_version>12 with 1.14.1.espnet
+        if optimize:
+            return 12
+
+        # LayerNormalization is defined from opset_version=17, and torch>=1.13
+        # exports layer_norm as a single node instead of ReduceMean, Sub, Pow, etc.
+        if V(torch.__version__) >= V("1.13.0"):
+            return 17
+        return 12
 
-    def _export_encoder(self, model, path, verbose):
+    def _export_encoder(self, model, path, verbose, optimize=False):
         if verbose:
             logging.info(f"Encoder model is saved in {file_name}")
-        self._export_model(model, verbose, path)
+        self._export_model(model, verbose, path, optimize=optimize)
 
-    def _export_frontend(self, model, path, verbose):
+    def _export_frontend(self, model, path, verbose, optimize=False):
         if verbose:
             logging.info(f"Frontend model is saved in {file_name}")
-        self._export_model(model, verbose, path)
+        self._export_model(model, verbose, path, optimize=optimize)
 
-    def _export_decoder(self, model, enc_size, path, verbose):
+    def _export_decoder(self, model, enc_size, path, verbose, optimize=False):
         if verbose:
             logging.info(f"Decoder model is saved in {file_name}")
-        self._export_model(model, verbose, path, enc_size)
+        self._export_model(model, verbose, path, enc_size, optimize=optimize)
 
-    def _export_ctc(self, model, enc_size, path, verbose):
+    def _export_ctc(self, model, enc_size, path, verbose, optimize=False):
         if verbose:
             logging.info(f"CTC model is saved in {file_name}")
-        self._export_model(model, verbose, path, enc_size)
+        self._export_model(model, verbose, path, enc_size, optimize=optimize)
 
-    def _export_lm(self, model, path, verbose):
+    def _export_lm(self, model, path, verbose, optimize=False):
         if verbose:
             logging.info(f"LM model is saved in {file_name}")
-        self._export_model(model, verbose, path)
+        self._export_model(model, verbose, path, optimize=optimize)
 
-    def _export_joint_network(self, model, path, verbose):
+    def _export_joint_network(self, model, path, verbose, optimize=False):
         if verbose:
             logging.info(f"JointNetwork model is saved in {file_name}")
-        self._export_model(model, verbose, path)
+        self._export_model(model, verbose, path, optimize=optimize)
 
     def _copy_files(self, model, path, verbose):
         # copy stats file
@@ -332,7 +355,16 @@ class ASRModelExport:
         for m in models:
             basename = os.path.basename(m).split(".")[0]
             export_file = os.path.join(model_to, basename + "_qt.onnx")
-            quantize_dynamic(m, export_file, op_types_to_quantize=op_types_to_quantize)
+            # Signed int8 weights with per-channel scales. Conv and Gather are
+            # left in float32 to keep the precision of subsampling and embedding.
+            quantize_dynamic(
+                m,
+                export_file,
+                op_types_to_quantize=op_types_to_quantize,
+                weight_type=QuantType.QInt8,
+                per_channel=True,
+                reduce_range=False,
+            )
             ret[basename] = export_file
             if os.path.exists(os.path.join(model_from, basename + "-opt.onnx")):
                 os.remove(os.path.join(model_from, basename + "-opt.onnx"))
@@ -364,6 +396,7 @@ class ASRModelExport:
                 model.hidden_size,
                 use_gpu=self.export_config["use_gpu"],
                 only_onnxruntime=self.export_config["only_onnxruntime"],
+                float16=self.export_config["float16"],
                 model_type=model_type,
             )
             os.remove(model_dir / model_name)
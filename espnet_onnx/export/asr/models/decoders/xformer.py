@@ -8,8 +8,7 @@ from espnet_onnx.export.asr.models.layers.decoder_layer import OnnxDecoderLayer
 from espnet_onnx.export.asr.models.layers.embed import Embedding
 from espnet_onnx.export.asr.models.layers.multihead_att import OnnxMultiHeadedAttention
 from espnet_onnx.utils.abs_model import AbsExportModel
-from espnet_onnx.utils.function import subsequent_mask
-from espnet_onnx.utils.torch_function import MakePadMask, subsequent_mask
+from espnet_onnx.utils.torch_function import MakePadMask, SubsequentMask
 
 
 class XformerDecoder(nn.Module, AbsExportModel):
@@ -18,6 +17,7 @@ class XformerDecoder(nn.Module, AbsExportModel):
         self.embed = Embedding(model.embed, max_seq_len)
         self.model = model
         self.make_pad_mask = MakePadMask(max_seq_len, flip=False)
+        self.subsequent_mask = SubsequentMask(max_seq_len)
         if isinstance(self.model.decoders[0].self_attn, MultiHeadedAttention):
             self.num_heads = self.model.decoders[0].self_attn.h
             self.hidden_size = self.model.decoders[0].self_attn.linear_out.out_features
@@ -38,11 +38,12 @@ class XformerDecoder(nn.Module, AbsExportModel):
             mask = mask[:, None, None, :]
         elif len(mask.shape) == 3:
             mask = mask[:, None, :]
-        mask = 1 - mask
+        # The subsequent mask is kept as bool until it is converted here.
+        mask = 1 - mask.type(torch.float32)
         return mask * -10000.0
 
     def forward(self, tgt, memory, cache):
-        mask = subsequent_mask(tgt.size(-1)).unsqueeze(0)  # (B, T)
+        mask = self.subsequent_mask(tgt.size(-1)).unsqueeze(0)  # (B, T)
 
         x = self.embed(tgt)
         mask = self.prepare_mask(mask)
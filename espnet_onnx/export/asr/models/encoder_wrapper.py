@@ -33,7 +33,9 @@ class DefaultEncoder(nn.Module, AbsExportModel):
             self.feats_dim = self.frontend_model.output_dim
 
     def forward(self, feats):
-        feats_length = torch.ones(feats[:, :, 0].shape).sum(dim=-1).type(torch.long)
+        # Take the length from the shape of feats instead of summing
+        # a tensor of ones over the feature frames.
+        feats_length = torch.ones(feats.shape[:1], dtype=torch.long) * feats.shape[1]
         return self.model(feats, feats_length)
 
     def get_output_size(self):
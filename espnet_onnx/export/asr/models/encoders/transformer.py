@@ -34,6 +34,10 @@ class TransformerEncoder(nn.Module, AbsExportModel):
         self.preencoder = preencoder
 
     def prepare_mask(self, mask):
+        # Keep the Sub+Mul form. The attention fusion of
+        # onnxruntime.transformers matches the mask path as
+        # Mul <- Sub <- (Cast) <- Unsqueeze, and folds it into the fused
+        # Attention node. Replacing it with Where would break the fusion.
         if len(mask.shape) == 2:
             mask = 1 - mask[:, None, None, :]
         elif len(mask.shape) == 3:
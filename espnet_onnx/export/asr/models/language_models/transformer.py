@@ -44,7 +44,7 @@ class TransformerLM(nn.Module, AbsExportModel):
         return mask * -10000.0
 
     def forward(self, y, cache):
-        feats_length = torch.ones(y.shape).sum(dim=-1).type(torch.long)
+        feats_length = torch.ones(y.shape[:1], dtype=torch.long) * y.shape[1]
         mask = self.make_pad_mask(feats_length)  # (B, T)
         mask = (y != 0) * mask
 
@@ -68,7 +68,23 @@ class Embedding(nn.Module):
             else:
                 self.model[-1] = get_pos_emb(model[-1], max_seq_len)
 
+        # Token embedding followed by positional encoding, as in XformerDecoder.
+        # Fold xscale of the positional encoding into the embedding weight,
+        # so that the exported graph is Gather and Add without Mul.
+        self.scaled_weight = None
+        if (
+            isinstance(self.model, nn.Sequential)
+            and len(self.model) == 2
+            and isinstance(self.model[0], nn.Embedding)
+            and type(self.model[1]) is OnnxPositionalEncoding
+            and self.model[1].use_cache
+        ):
+            self.scaled_weight = self.model[0].weight.detach() * self.model[1].xscale
+
     def forward(self, x, mask=None):
+        if self.scaled_weight is not None:
+            pe = self.model[1].pe
+            return nn.functional.embedding(x, self.scaled_weight) + pe[:, : x.size(1)]
         if mask is None:
             return self.model(x)
         else:
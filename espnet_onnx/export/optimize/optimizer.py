@@ -10,8 +10,12 @@ def optimize_model(
     hidden_size: int = 0,
     use_gpu: bool = False,
     only_onnxruntime: bool = False,
+    float16: bool = False,
     model_type: str = "bert",
 ):
+    if float16 and not use_gpu:
+        raise ValueError("float16=True is only supported with use_gpu=True.")
+
     args = [
         "python",
         "-m",
@@ -31,6 +35,9 @@ def optimize_model(
     if only_onnxruntime:
         args.extend(["--only_onnxruntime"])
 
+    if float16:
+        args.extend(["--float16"])
+
     args.extend(["--model_type", model_type])
 
     subprocess.check_call(args)
@@ -115,21 +115,24 @@ def make_pad_mask(lengths, xs=None, dim=-1, xs_shape=None):
                  [0, 0, 1, 1, 1, 1],
                  [0, 0, 1, 1, 1, 1]]])
     """
+    lengths = np.asarray(lengths)
     if xs is not None:
-        base = np.zeros(xs.shape)
+        shape = xs.shape
     else:
-        base = np.zeros((len(lengths), max(lengths)))
-
-    if len(base.shape) == 3 and dim == 1:
-        base = base.transpose(0, 2, 1)
-
-    for i in range(len(base)):
-        base[i][..., lengths[i] :] = 1
-
-    if len(base.shape) == 3 and dim == 1:
-        base = base.transpose(0, 2, 1)
+        shape = (len(lengths), int(lengths.max()))
+
+    is_dim1 = len(shape) == 3 and dim == 1
+    maxlen = shape[1] if is_dim1 else shape[-1]
+    # compare positions with lengths at once instead of filling each row.
+    mask = np.arange(maxlen) >= lengths[:, None]  # (B, maxlen)
+    if is_dim1:
+        mask = mask[:, :, None]
+    else:
+        # the mask is on the last axis for any other rank.
+        mask = mask.reshape(len(lengths), *[1] * (len(shape) - 2), maxlen)
+    mask = np.broadcast_to(mask, shape)
 
-    return base
+    return mask.astype(np.float64)
 
 
 def topk(x: np.ndarray, k: int, require_value: bool = False):
@@ -184,7 +187,9 @@ def pad_sequence(yseqs, batch_first=False, padding_value=0):
 
     max_idx = np.argmax([y.shape[0] for y in yseqs])
     max_shape = yseqs[max_idx].shape
-    base = np.ones((len(yseqs), *max_shape)) * padding_value
+    # keep the dtype of the sequences, so that token ids are not
+    # converted into float64 and cast back to int64 on every step.
+    base = np.full((len(yseqs), *max_shape), padding_value, dtype=yseqs[0].dtype)
     for i, y in enumerate(yseqs):
         base[i][: y.shape[0]] = y
     if batch_first:
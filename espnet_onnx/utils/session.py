@@ -0,0 +1,46 @@
+import onnxruntime
+
+_env_allocator_registered = False
+
+
+def register_env_allocator():
+    """Register a CPU arena allocator shared by all sessions.
+    Sessions created with `session.use_env_allocators` reuse this arena,
+    so memory freed by the encoder can be reused by the decoder and LM.
+    Returns False if the installed onnxruntime does not support it.
+    """
+    global _env_allocator_registered
+    if _env_allocator_registered:
+        return True
+
+    if not hasattr(onnxruntime, "create_and_register_allocator"):
+        return False
+
+    mem_info = onnxruntime.OrtMemoryInfo(
+        "Cpu",
+        onnxruntime.OrtAllocatorType.ORT_ARENA_ALLOCATOR,
+        0,
+        onnxruntime.OrtMemType.DEFAULT,
+    )
+    # use the default arena configuration
+    arena_cfg = onnxruntime.OrtArenaCfg(0, -1, -1, -1)
+    onnxruntime.create_and_register_allocator(mem_info, arena_cfg)
+    _env_allocator_registered = True
+    return True
+
+
+def get_session_options(intra_op_num_threads=0):
+    """SessionOptions for the sessions used in a single inference.
+    The encoder, decoder and LM run one after another, so they share the
+    CPU arena allocator. `intra_op_num_threads=0` keeps the default of
+    onnxruntime, which uses one thread per physical core.
+    """
+    so = onnxruntime.SessionOptions()
+    so.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    so.enable_mem_pattern = True
+    so.enable_cpu_mem_arena = True
+    so.intra_op_num_threads = intra_op_num_threads
+    so.inter_op_num_threads = 1
+    if register_env_allocator():
+        so.add_session_config_entry("session.use_env_allocators", "1")
+    return so
@@ -1,6 +1,5 @@
 from typing import Optional
 
-import numpy as np
 import torch
 import torch.nn as nn
 
@@ -8,10 +7,10 @@ import torch.nn as nn
 class MakePadMask(nn.Module):
     def __init__(self, max_seq_len=512, flip=True):
         super().__init__()
-        if flip:
-            self.mask_pad = torch.Tensor(1 - np.tri(max_seq_len)).type(torch.bool)
-        else:
-            self.mask_pad = torch.Tensor(np.tri(max_seq_len)).type(torch.bool)
+        self.flip = flip
+        # Cached as a constant so that the exported graph does not
+        # need Range to create the positions on every call.
+        self.arange = torch.arange(int(max_seq_len))
 
     def forward(self, lengths, xs=None, length_dim=-1, maxlen=None):
         """Make mask tensor containing indices of padded part.
@@ -35,7 +34,11 @@ class MakePadMask(nn.Module):
         else:
             m = torch.max(lengths)
 
-        mask = self.mask_pad[lengths - 1][..., :m].type(torch.float32)
+        if self.flip:
+            mask = self.arange[:m] >= lengths.unsqueeze(-1)
+        else:
+            mask = self.arange[:m] < lengths.unsqueeze(-1)
+        mask = mask.type(torch.float32)
 
         if length_dim == 1:
             return mask.transpose(1, 2)
@@ -43,6 +46,22 @@ class MakePadMask(nn.Module):
             return mask
 
 
+class SubsequentMask(nn.Module):
+    def __init__(self, max_seq_len=512):
+        super().__init__()
+        # Only the positions are cached, so the exported constant
+        # is O(max_seq_len) rather than the full triangle.
+        self.arange = torch.arange(int(max_seq_len))
+
+    def forward(self, size):
+        """Create bool mask for subsequent steps (size, size).
+        This is a workaround for torch.tril, which is not supported
+        with the opset used for optimization.
+        """
+        arange = self.arange[:size]
+        return arange.unsqueeze(-1) >= arange
+
+
 def normalize(
     input: torch.Tensor,
     p: float = 2.0,
@@ -55,13 +74,3 @@ def normalize(
     else:
         denom = input.norm(p, dim, keepdim=True).expand_as(input)
         return torch.div(input, denom, out=out)
-
-
-def subsequent_mask(size: torch.Tensor):
-    # workaround for torch.tril
-    # tril() is a supported op with opset_version>14,
-    # but opset_version>13 may cause optimization error.
-    arange = torch.arange(size)
-    arange2 = torch.arange(size)
-    mask = arange.unsqueeze(-1).expand(-1, size) >= (arange2)
-    return torch.ones(size, size).masked_fill(mask == 0, 0)
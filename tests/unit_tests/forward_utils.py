@@ -1,8 +1,8 @@
 import numpy as np
 import torch
+from espnet.nets.pytorch_backend.transformer.mask import subsequent_mask
 
 from espnet_onnx.utils.function import make_pad_mask, mask_fill
-from espnet_onnx.utils.torch_function import subsequent_mask
 
 
 def run_onnx_enc(model, dummy_input, model_type):
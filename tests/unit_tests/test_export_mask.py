@@ -0,0 +1,98 @@
+import numpy as np
+import onnxruntime as ort
+import pytest
+import torch
+import torch.nn as nn
+
+from espnet_onnx.utils.torch_function import MakePadMask
+
+PROVIDERS = ["CPUExecutionProvider"]
+
+
+class MakePadMaskTable(nn.Module):
+    # previous implementation of MakePadMask, used as the reference.
+    def __init__(self, max_seq_len=512, flip=True):
+        super().__init__()
+        if flip:
+            self.mask_pad = torch.Tensor(1 - np.tri(max_seq_len)).type(torch.bool)
+        else:
+            self.mask_pad = torch.Tensor(np.tri(max_seq_len)).type(torch.bool)
+
+    def forward(self, lengths, xs=None, length_dim=-1, maxlen=None):
+        if xs is not None and len(xs.shape) == 3:
+            if length_dim == 1:
+                lengths = lengths.unsqueeze(1).expand(*xs.transpose(1, 2).shape[:2])
+            else:
+                lengths = lengths.unsqueeze(1).expand(*xs.shape[:2])
+
+        if maxlen is not None:
+            m = maxlen
+        elif xs is not None:
+            m = xs.shape[-1]
+        else:
+            m = torch.max(lengths)
+
+        mask = self.mask_pad[lengths - 1][..., :m].type(torch.float32)
+
+        if length_dim == 1:
+            return mask.transpose(1, 2)
+        else:
+            return mask
+
+
+class MaskWrapper(nn.Module):
+    def __init__(self, model, length_dim):
+        super().__init__()
+        self.model = model
+        self.length_dim = length_dim
+
+    def forward(self, lengths, xs):
+        return self.model(lengths, xs, self.length_dim)
+
+
+mask_cases = [
+    (True, None, -1, None),
+    (False, None, -1, None),
+    (True, None, -1, 7),
+    (False, None, -1, 7),
+    (True, (3, 4, 6), -1, None),
+    (False, (3, 4, 6), -1, None),
+    (True, (3, 6, 6), 1, None),
+    (False, (3, 6, 6), 1, None),
+]
+
+
+@pytest.mark.parametrize("flip, xs_shape, length_dim, maxlen", mask_cases)
+def test_make_pad_mask(flip, xs_shape, length_dim, maxlen):
+    lengths = torch.LongTensor([5, 3, 2])
+    xs = None if xs_shape is None else torch.zeros(xs_shape)
+    expected = MakePadMaskTable(32, flip)(lengths, xs, length_dim, maxlen)
+    mask = MakePadMask(32, flip)(lengths, xs, length_dim, maxlen)
+    assert mask.dtype == expected.dtype
+    torch.testing.assert_close(mask, expected)
+
+
+@pytest.mark.parametrize("flip, length_dim", [(True, -1), (False, -1), (True, 1)])
+def test_export_make_pad_mask(flip, length_dim, tmp_path):
+    model = MaskWrapper(MakePadMask(32, flip), length_dim)
+    model_file = str(tmp_path / "make_pad_mask.onnx")
+    torch.onnx.export(
+        model,
+        (torch.LongTensor([5, 3, 2]), torch.zeros(3, 6, 6)),
+        model_file,
+        opset_version=12,
+        input_names=["lengths", "xs"],
+        output_names=["mask"],
+        dynamic_axes={
+            "lengths": {0: "batch"},
+            "xs": {0: "batch", 1: "length", 2: "length"},
+        },
+    )
+    session = ort.InferenceSession(model_file, providers=PROVIDERS)
+
+    # check with the shapes that are not used for export.
+    lengths = torch.LongTensor([8, 2, 5, 1])
+    xs = torch.zeros(4, 8, 8)
+    expected = MakePadMaskTable(32, flip)(lengths, xs, length_dim)
+    mask = session.run(["mask"], {"lengths": lengths.numpy(), "xs": xs.numpy()})[0]
+    np.testing.assert_array_equal(mask, expected.numpy())
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from espnet_onnx.utils.function import make_pad_mask
+
+
+def make_pad_mask_loop(lengths, xs=None, dim=-1):
+    # previous implementation of make_pad_mask, used as the reference.
+    if xs is not None:
+        base = np.zeros(xs.shape)
+    else:
+        base = np.zeros((len(lengths), max(lengths)))
+
+    if len(base.shape) == 3 and dim == 1:
+        base = base.transpose(0, 2, 1)
+
+    for i in range(len(base)):
+        base[i][..., lengths[i] :] = 1
+
+    if len(base.shape) == 3 and dim == 1:
+        base = base.transpose(0, 2, 1)
+
+    return base
+
+
+make_pad_mask_cases = [
+    ([5, 3, 2], None, -1),
+    (np.array([5, 3, 2]), None, -1),
+    ([1], None, -1),
+    ([5, 3, 2], (3, 2, 4), -1),
+    ([5, 3, 2], (3, 2, 6), -1),
+    ([5, 3, 2], (3, 6, 6), 2),
+    ([5, 3, 2], (3, 6, 6), 1),
+    ([5, 3, 2], (3, 7, 4), 1),
+    ([5, 3, 2], (3, 7, 6, 2), 1),
+    ([5, 3, 2], (3, 7, 6, 2), -1),
+    ([5, 3, 2], (3, 7, 6, 8), -1),
+]
+
+
+@pytest.mark.parametrize("lengths, xs_shape, dim", make_pad_mask_cases)
+def test_make_pad_mask(lengths, xs_shape, dim):
+    xs = None if xs_shape is None else np.zeros(xs_shape)
+    expected = make_pad_mask_loop(lengths, xs, dim)
+    mask = make_pad_mask(lengths, xs, dim)
+    assert mask.shape == expected.shape
+    assert mask.dtype == expected.dtype
+    np.testing.assert_array_equal(mask, expected)
@@ -171,6 +171,56 @@ def test_infer_decoder(dec_type, feat_lens, load_config, get_class):
         check_output(torch_out, onnx_out)
 
 
+@pytest.mark.parametrize("dec_type, n_batch, n_steps", [("transformer", 3, 3)])
+def test_infer_decoder_batch_states(
+    dec_type, n_batch, n_steps, load_config, get_class
+):
+    model_dir = CACHE_DIR / "decoder" / f"./cache_{dec_type}"
+    model_config = load_config(dec_type, model_type="decoder")
+
+    # prepare decoder model
+    decoder_espnet = get_class(
+        "decoder",
+        model_config.decoder,
+        model_config.decoder_conf.dic,
+        vocab_size=32000,
+        encoder_output_size=256,
+    )
+    decoder_espnet.load_state_dict(torch.load(glob.glob(str(model_dir / "*.pth"))[0]))
+    decoder_espnet.eval()
+    decoder_onnx = get_decoder(
+        get_config(model_dir / "config.yaml"), providers=PROVIDERS
+    )
+
+    # all hypotheses share the encoder output, as in beam search.
+    dummy_input = torch.randn(1, 50, 256).repeat(n_batch, 1, 1)
+    ys = torch.zeros(n_batch, 1, dtype=torch.long)
+    torch_states = [None] * n_batch
+    onnx_states = [None] * n_batch
+    # select hypotheses out of order and twice, as beam search may do.
+    order = [n_batch - 1] + list(range(n_batch - 1))
+    order[-1] = order[0]
+
+    for _ in range(n_steps):
+        torch_out, torch_states = decoder_espnet.batch_score(
+            ys, torch_states, dummy_input
+        )
+        onnx_out, onnx_states = decoder_onnx.batch_score(
+            ys.numpy(), onnx_states, dummy_input.numpy()
+        )
+        check_output(torch_out, onnx_out)
+
+        # feed the selected states back into the next step
+        torch_states = [torch_states[i] for i in order]
+        onnx_states = [onnx_states[i] for i in order]
+        # the onnx cache starts with a zero frame, so it is one frame longer.
+        for state_t, state_o in zip(torch_states, onnx_states):
+            check_output(torch.stack(state_t), state_o[:, 1:])
+
+        next_token = torch.argmax(torch_out, dim=-1, keepdim=True)
+        ys = torch.cat([ys, next_token], dim=1)[order]
+
+
 @pytest.mark.parametrize("lm_type, feat_lens", lm_cases)
 def test_infer_lm(lm_type, feat_lens, load_config, get_class):
     model_dir = CACHE_DIR / "lm" / f"./cache_{lm_type}"
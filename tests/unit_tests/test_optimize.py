@@ -5,7 +5,7 @@ import torch
 import pytest
 
 from espnet_onnx.export.optimize.optimizer import optimize_model
-from espnet_onnx.export.asr.models import get_encoder
+from espnet_onnx.export.asr.models import get_decoder, get_encoder
 
 from ..op_test_utils import check_op_type_count
 
@@ -63,7 +63,25 @@ def test_optimize(
         )
         enc_wrapper = get_encoder(encoder, frontend, None, { "optimize": True }, get_convert_map)
         print(enc_wrapper)
-        model_export._export_encoder(enc_wrapper, export_dir, verbose=False)
+        model_export._export_encoder(
+            enc_wrapper, export_dir, verbose=False, optimize=True
+        )
+
+    elif model_type == "decoder":
+        export_dir = model_export.cache_dir / "test" / model_type / f"cache_{model_name}_opt"
+        export_dir.mkdir(parents=True, exist_ok=True)
+        model_config = load_config(model_name, model_type="decoder")
+        decoder = get_class(
+            "decoder",
+            model_config.decoder,
+            model_config.decoder_conf.dic,
+            vocab_size=32000,
+            encoder_output_size=256,
+        )
+        dec_wrapper = get_decoder(decoder, { "optimize": True })
+        model_export._export_decoder(
+            dec_wrapper, 256, export_dir, verbose=False, optimize=True
+        )
 
     output_dir = (
         model_export.cache_dir